@@ -0,0 +1,59 @@
+"""
+Helpers shared by scan.py, list_submissions.py and ai/run_ai.py.
+"""
+
+import csv
+import re
+from pathlib import Path
+from typing import Tuple
+
+# Optional git@github.com: or scheme://host/ prefix, then owner/repo; a trailing .git
+# and any extra path (e.g. /tree/<sha>/subdir) are dropped.
+REPO_URL_RE = re.compile(
+    r"^(?:git@github\.com:|[A-Za-z][A-Za-z0-9+.-]*://[^/]*/)?/*([^/\s]+)/([^/\s]+?)(?:\.git)?(?:/.*)?$"
+)
+
+
+def parse_repo_url(raw: str) -> Tuple[str, str]:
+    """
+    Normalize a repo URL/slug to (owner/repo slug, clone_url).
+    Accepts GitHub page URL, HTTPS .git, SSH git@github.com:owner/repo.git, or slug owner/repo.
+    """
+    if not raw:
+        raise ValueError("Empty repo URL")
+    trimmed = raw.strip()
+    match = REPO_URL_RE.match(trimmed)
+    if not match:
+        raise ValueError(f"Could not extract owner/repo from: {raw}")
+    slug = f"{match.group(1)}/{match.group(2)}"
+    clone_url = trimmed if ("://" in trimmed or trimmed.startswith("git@")) else f"https://github.com/{slug}.git"
+    return slug, clone_url
+
+
+def load_repos_map(csv_path: Path) -> dict:
+    mapping = {}
+    with csv_path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = {name: i for i, name in enumerate(header)}
+        url_idx = idx.get("repo_url")
+        id_idx = idx.get("id")
+        repo_idx = idx.get("repo")
+
+        def cell(row: list[str], i: int | None) -> str:
+            return row[i].strip() if i is not None and i < len(row) else ""
+
+        for row in reader:
+            if url_idx is not None:
+                raw = cell(row, url_idx)
+                if not raw:
+                    continue
+                try:
+                    slug, _ = parse_repo_url(raw)
+                except ValueError:
+                    continue
+                repo_id = cell(row, id_idx) or slug.replace("/", "-")
+                mapping[repo_id] = slug
+            elif cell(row, id_idx) and cell(row, repo_idx):
+                mapping[cell(row, id_idx)] = cell(row, repo_idx)
+    return mapping
@@ -4,127 +4,208 @@ Optional AI analysis runner using codex CLI.
 """
 
 import argparse
-import csv
 import json
 import logging
+import os
+import re
+import shutil
 import subprocess
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Tuple
 from textwrap import shorten
 
+# Make the repo root importable when run as a script (python3 ai/run_ai.py), so the shared
+# helpers resolve as ai._common both then and under python3 -m ai.run_ai.
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
 
-def parse_repo_url(raw: str) -> Tuple[str, str]:
-    if raw.startswith("git@github.com:"):
-        path_part = raw.split(":", 1)[1]
-    elif "://" in raw:
-        after_scheme = raw.split("://", 1)[1]
-        path_part = after_scheme.split("/", 1)[1] if "/" in after_scheme else ""
-    else:
-        path_part = raw
-    path_part = path_part.strip("/")
-    if path_part.endswith(".git"):
-        path_part = path_part[:-4]
-    parts = path_part.split("/")
-    if len(parts) < 2:
-        raise ValueError(f"Cannot parse repo URL: {raw}")
-    owner, repo = parts[0], parts[1]
-    slug = f"{owner}/{repo}"
-    return slug, raw
-
-
-def load_repos_map(csv_path: Path) -> dict:
-    mapping = {}
-    with csv_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if "repo_url" in reader.fieldnames:
-                raw = row.get("repo_url", "").strip()
-                if not raw:
-                    continue
-                try:
-                    slug, _ = parse_repo_url(raw)
-                except ValueError:
-                    continue
-                repo_id = row.get("id", "").strip() or slug.replace("/", "-")
-                mapping[repo_id] = slug
-            elif row.get("id") and row.get("repo"):
-                mapping[row["id"].strip()] = row["repo"].strip()
-    return mapping
+from ai._common import load_repos_map  # noqa: E402
+
+logger = logging.getLogger("ai")
+
+# Lowercased README file names, and VCS/dependency/build directories never worth listing.
+README_NAMES = frozenset({"readme.md", "readme"})
+SKIP_DIRS = frozenset({".git", "__pycache__", "node_modules", ".venv", "dist", "build", ".next", ".cache"})
+
+PLACEHOLDER_RE = re.compile(
+    r"\{\{(HACKATHON_CONTEXT|REPO_ID|REPO|METRICS_JSON|FILE_TREE|README_SNIPPET)\}\}"
+)
 
 
 def load_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def find_candidate_readmes(repo_dir: Path) -> list[Path]:
-    names = {"README.md", "README.MD", "README", "readme.md", "readme"}
+def load_metrics_json(path: Path) -> str:
+    raw = path.read_text(encoding="utf-8")
+    # scan.py already writes metrics with indent=2; only reformat files written some other way.
+    if raw.startswith("{\n  "):
+        return raw
+    return json.dumps(json.loads(raw), indent=2)
+
+
+def find_candidate_readmes(repo_dir: Path, max_depth: int = 4) -> list[Path]:
     candidates = []
-    for path in repo_dir.rglob("*"):
-        if path.name in names and path.is_file() and ".git" not in path.parts:
-            candidates.append(path)
+    queue = deque([(str(repo_dir), 0)])
+    while queue:
+        dir_path, depth = queue.popleft()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth + 1 < max_depth and entry.name not in SKIP_DIRS:
+                            queue.append((entry.path, depth + 1))
+                    elif entry.name.lower() in README_NAMES and entry.is_file():
+                        candidates.append(Path(entry.path))
+        except OSError:
+            continue
     return candidates
 
 
+def read_text_head(path: Path, limit_chars: int) -> str:
+    # shorten() keeps at most limit_chars, so there is no need to read a multi-MB README
+    # in full; 4 bytes per char covers any UTF-8 text plus collapsed whitespace.
+    with path.open("rb") as f:
+        raw = f.read(limit_chars * 4)
+    return raw.decode("utf-8", errors="ignore")
+
+
 def read_best_readme(repo_dir: Path, limit_chars: int = 4000) -> str:
+    # Most repos have a meaningful top-level README; check it before walking the tree.
+    for name in ("README.md", "readme.md", "README", "README.MD", "readme"):
+        top_level = repo_dir / name
+        if top_level.is_file():
+            content = read_text_head(top_level, limit_chars)
+            if len(content.strip()) > 50:
+                return shorten(content, width=limit_chars, placeholder="... [truncated]")
     candidates = find_candidate_readmes(repo_dir)
     if not candidates:
         return "No README found."
     # pick the longest meaningful README (by size), preferring shorter than limit but >50 chars
     candidates.sort(key=lambda p: p.stat().st_size, reverse=True)
     for candidate in candidates:
-        content = candidate.read_text(encoding="utf-8", errors="ignore")
+        content = read_text_head(candidate, limit_chars)
         if len(content.strip()) > 50:
             return shorten(content, width=limit_chars, placeholder="... [truncated]")
-    content = candidates[0].read_text(encoding="utf-8", errors="ignore")
+    content = read_text_head(candidates[0], limit_chars)
     return shorten(content, width=limit_chars, placeholder="... [truncated]")
 
 
 def render_tree(repo_dir: Path, max_entries: int = 200, max_depth: int = 3) -> str:
-    lines = []
+    def list_dir(dir_path: str, depth: int) -> list[tuple[os.DirEntry, int]]:
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name.lower())
+        except OSError:
+            return []
+        # Reversed so that popping from the stack visits entries in sorted order.
+        return [(entry, depth) for entry in reversed(entries) if entry.name not in SKIP_DIRS]
 
-    def walk(path: Path, depth: int) -> None:
-        nonlocal lines
-        if len(lines) >= max_entries:
-            return
+    lines = []
+    stack = list_dir(str(repo_dir), 0)
+    while stack and len(lines) < max_entries:
+        entry, depth = stack.pop()
         prefix = "  " * depth
-        try:
-            entries = sorted(path.iterdir(), key=lambda p: p.name.lower())
-        except Exception:
-            return
-        for entry in entries:
-            if len(lines) >= max_entries:
-                return
-            name = entry.name
-            if name in {".git", "__pycache__", "node_modules"}:
-                continue
-            lines.append(f"{prefix}{name}/" if entry.is_dir() else f"{prefix}{name}")
-            if entry.is_dir() and depth + 1 < max_depth:
-                walk(entry, depth + 1)
+        is_dir = entry.is_dir(follow_symlinks=False)
+        lines.append(f"{prefix}{entry.name}/" if is_dir else f"{prefix}{entry.name}")
+        if is_dir and depth + 1 < max_depth:
+            stack.extend(list_dir(entry.path, depth + 1))
 
-    walk(repo_dir, 0)
     if len(lines) >= max_entries:
         lines.append("... [truncated]")
     return "\n".join(lines) if lines else "No files listed."
 
 
+def compile_prompt(template: str, context: str) -> list[str]:
+    """
+    Split the template once into literal fragments (even indices) and placeholder
+    names (odd indices), with the run-wide hackathon context already filled in.
+    """
+    parts = [""]
+    for idx, piece in enumerate(PLACEHOLDER_RE.split(template)):
+        if idx % 2 == 0:
+            parts[-1] += piece
+        elif piece == "HACKATHON_CONTEXT":
+            parts[-1] += context
+        else:
+            parts.extend((piece, ""))
+    return parts
+
+
 def build_prompt(
-    template: str,
-    context: str,
+    prompt_parts: list[str],
     repo_id: str,
     repo: str,
     metrics_json: str,
     file_tree: str,
     readme_snippet: str,
 ) -> str:
-    return (
-        template.replace("{{HACKATHON_CONTEXT}}", context)
-        .replace("{{REPO_ID}}", repo_id)
-        .replace("{{REPO}}", repo)
-        .replace("{{METRICS_JSON}}", metrics_json)
-        .replace("{{FILE_TREE}}", file_tree)
-        .replace("{{README_SNIPPET}}", readme_snippet)
+    values = {
+        "REPO_ID": repo_id,
+        "REPO": repo,
+        "METRICS_JSON": metrics_json,
+        "FILE_TREE": file_tree,
+        "README_SNIPPET": readme_snippet,
+    }
+    return "".join(values[part] if idx % 2 else part for idx, part in enumerate(prompt_parts))
+
+
+def process_repo(
+    repo_id: str,
+    repo: str,
+    metrics_path: Path,
+    work_dir: Path,
+    ai_outputs_dir: Path,
+    prompt_parts: list[str],
+    codex_bin: str,
+    model: str,
+) -> None:
+    metrics_json = load_metrics_json(metrics_path)
+    repo_dir = work_dir / "repos" / repo_id
+    # Only walk the clone for the code context the template actually asks for.
+    placeholders = prompt_parts[1::2]
+    file_tree = readme_snippet = ""
+    if "FILE_TREE" in placeholders:
+        file_tree = render_tree(repo_dir) if repo_dir.exists() else "Repo directory not found."
+    if "README_SNIPPET" in placeholders:
+        readme_snippet = read_best_readme(repo_dir) if repo_dir.exists() else "Repo directory not found."
+    prompt = build_prompt(
+        prompt_parts,
+        repo_id,
+        repo,
+        metrics_json,
+        file_tree,
+        readme_snippet,
     )
 
+    logger.info("Running codex for %s", repo_id)
+    output_path = ai_outputs_dir / f"{repo_id}.txt"
+    # codex writes straight into the output file; stderr is only read back on failure.
+    try:
+        with output_path.open("wb") as out, tempfile.TemporaryFile() as err:
+            result = subprocess.run(
+                [codex_bin, "--yolo", "exec", "--sandbox", "danger-full-access", "--model", model, prompt],
+                stdout=out,
+                stderr=err,
+            )
+            err.seek(0)
+            stderr = err.read().decode("utf-8", errors="replace") if result.returncode != 0 else ""
+    except FileNotFoundError as exc:
+        logger.error("codex CLI not found: %s", exc)
+        output_path.write_text("ERROR: codex CLI not available\n", encoding="utf-8")
+        return
+
+    if result.returncode != 0:
+        logger.error("codex failed for %s: %s", repo_id, stderr.strip())
+        output_path.write_text(f"ERROR: codex failed ({result.returncode})\n{stderr}", encoding="utf-8")
+        return
+
+    logger.info("Wrote AI output to %s", output_path)
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run optional AI analysis via codex CLI.")
@@ -132,6 +213,7 @@ def main() -> None:
     parser.add_argument("--repos-csv", default="data/repos.csv", help="Path to repos.csv")
     parser.add_argument("--only-id", help="Run AI analysis only for this repo id")
     parser.add_argument("--model", default="gpt-5.1-codex-mini", help="Model name for codex CLI")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of codex runs in parallel")
     args = parser.parse_args()
 
     work_dir = Path(args.work_dir)
@@ -140,7 +222,6 @@ def main() -> None:
     ai_outputs_dir.mkdir(parents=True, exist_ok=True)
 
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
-    logger = logging.getLogger("ai")
 
     repos_map = load_repos_map(Path(args.repos_csv))
     context_path = Path("ai") / "hackathon_context.md"
@@ -150,8 +231,12 @@ def main() -> None:
         logger.error("Missing AI context or template files.")
         return
 
-    hackathon_context = load_text(context_path)
-    prompt_template = load_text(template_path)
+    prompt_parts = compile_prompt(load_text(template_path), load_text(context_path))
+
+    codex_bin = shutil.which("codex")
+    if not codex_bin:
+        logger.error("codex CLI not found in PATH.")
+        return
 
     if args.only_id:
         target_ids = [args.only_id]
@@ -160,51 +245,36 @@ def main() -> None:
             path.stem for path in metrics_dir.glob("*.json") if not path.name.endswith("_commits.json")
         ]
 
-    for repo_id in target_ids:
-        metrics_path = metrics_dir / f"{repo_id}.json"
-        if not metrics_path.exists():
-            logger.warning("Metrics file missing for %s, skipping.", repo_id)
-            continue
-        if repo_id not in repos_map:
-            logger.warning("Repo id %s not found in repos.csv, skipping.", repo_id)
-            continue
-        repo = repos_map[repo_id]
-        metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
-        repo_dir = work_dir / "repos" / repo_id
-        file_tree = render_tree(repo_dir) if repo_dir.exists() else "Repo directory not found."
-        readme_snippet = read_best_readme(repo_dir) if repo_dir.exists() else "Repo directory not found."
-        prompt = build_prompt(
-            prompt_template,
-            hackathon_context,
-            repo_id,
-            repo,
-            json.dumps(metrics, indent=2),
-            file_tree,
-            readme_snippet,
-        )
-
-        logger.info("Running codex for %s", repo_id)
-        try:
-            result = subprocess.run(
-                ["codex", "--yolo", "exec", "--sandbox", "danger-full-access", "--model", args.model, prompt],
-                capture_output=True,
-                text=True,
-            )
-        except FileNotFoundError as exc:
-            logger.error("codex CLI not found: %s", exc)
-            (ai_outputs_dir / f"{repo_id}.txt").write_text(
-                "ERROR: codex CLI not available\n", encoding="utf-8"
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = {}
+        for repo_id in target_ids:
+            metrics_path = metrics_dir / f"{repo_id}.json"
+            if not metrics_path.exists():
+                logger.warning("Metrics file missing for %s, skipping.", repo_id)
+                continue
+            if repo_id not in repos_map:
+                logger.warning("Repo id %s not found in repos.csv, skipping.", repo_id)
+                continue
+            future = executor.submit(
+                process_repo,
+                repo_id,
+                repos_map[repo_id],
+                metrics_path,
+                work_dir,
+                ai_outputs_dir,
+                prompt_parts,
+                codex_bin,
+                args.model,
             )
-            continue
-
-        output_path = ai_outputs_dir / f"{repo_id}.txt"
-        if result.returncode != 0:
-            logger.error("codex failed for %s: %s", repo_id, result.stderr.strip())
-            output_path.write_text(f"ERROR: codex failed ({result.returncode})\n{result.stderr}", encoding="utf-8")
-            continue
+            futures[future] = repo_id
 
-        output_path.write_text(result.stdout, encoding="utf-8")
-        logger.info("Wrote AI output to %s", output_path)
+        for done, future in enumerate(as_completed(futures), start=1):
+            repo_id = futures[future]
+            try:
+                future.result()
+            except Exception as exc:
+                logger.error("AI analysis failed for %s: %s", repo_id, exc)
+            logger.info("Finished %s (%d/%d)", repo_id, done, len(futures))
 
 
 if __name__ == "__main__":
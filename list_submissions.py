@@ -16,53 +16,27 @@ from __future__ import annotations
 import argparse
 import csv
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
+from ai._common import parse_repo_url
 
-def parse_repo_url(raw: str) -> Tuple[str, str]:
-    """
-    Normalize a repo URL/slug to (owner/repo slug, clone_url).
-    Accepts GitHub page URL, HTTPS .git, SSH git@github.com:owner/repo.git, or slug owner/repo.
-    """
-    if not raw:
-        raise ValueError("Empty repo URL")
-    trimmed = raw.strip()
-    if trimmed.startswith("git@github.com:"):
-        path_part = trimmed.split(":", 1)[1]
-    elif "://" in trimmed:
-        after_scheme = trimmed.split("://", 1)[1]
-        if "/" in after_scheme:
-            path_part = after_scheme.split("/", 1)[1]
-        else:
-            raise ValueError(f"Could not parse repo URL: {raw}")
-    else:
-        path_part = trimmed
-
-    path_part = path_part.strip("/")
-    if path_part.endswith(".git"):
-        path_part = path_part[:-4]
-    parts = path_part.split("/")
-    if len(parts) < 2:
-        raise ValueError(f"Could not extract owner/repo from: {raw}")
-    owner, repo = parts[0], parts[1]
-    slug = f"{owner}/{repo}"
-    clone_url = raw if ("://" in trimmed or trimmed.startswith("git@")) else f"https://github.com/{slug}.git"
-    return slug, clone_url
-
-
-def derive_team_name(row: Dict[str, str], slug: str) -> str:
-    for key in ("team_name", "Team Name", "team", "name", "id"):
-        val = row.get(key, "")
-        if val and val.strip():
-            return val.strip()
-    return slug.replace("/", "-")
 
+def derive_team_name(row: List[str], name_indices: Tuple[int, ...], slug: str) -> str:
+    return _first_non_empty(row, name_indices) or slug.replace("/", "-")
 
-def _first_non_empty(row: Dict[str, str], keys: Tuple[str, ...]) -> str:
-    """Return the first non-empty value for the provided keys."""
-    for key in keys:
-        val = row.get(key, "")
+
+def _column_indices(header: List[str], keys: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Resolve the header positions of the provided keys, in key order, skipping missing ones."""
+    idx = {name: i for i, name in enumerate(header)}
+    return tuple(idx[key] for key in keys if key in idx)
+
+
+def _first_non_empty(row: List[str], indices: Tuple[int, ...]) -> str:
+    """Return the first non-empty value for the provided column indices."""
+    for i in indices:
+        val = row[i] if i < len(row) else ""
         if val and val.strip():
             return val.strip()
     return ""
@@ -72,10 +46,18 @@ def load_repo_name_map(path: Path) -> Dict[str, str]:
     """
     Load a mapping of repo slug -> submitted project name from a CSV.
     Accepts comma- or tab-delimited files; ignores rows without a valid repo URL.
+    Parsed results are cached per file and reused until the file changes.
     """
     if not path.exists():
         return {}
+    stat = path.stat()
+    return dict(_load_repo_name_map_cached(str(path), stat.st_mtime_ns, stat.st_size))
+
 
+@lru_cache(maxsize=8)
+def _load_repo_name_map_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Parse the repo map; mtime_ns and size only key the cache so edits invalidate it."""
+    path = Path(path_str)
     repo_keys = (
         "Please provide the Github URL of your project (should be publicly accessible)",
         "repo_url",
@@ -93,21 +75,21 @@ def load_repo_name_map(path: Path) -> Dict[str, str]:
 
     repo_map: Dict[str, str] = {}
     with path.open(newline="", encoding="utf-8") as f:
+        # Exports are either tab- or comma-delimited, never mixed; a tab is enough to tell.
         sample = f.read(2048)
         f.seek(0)
-        try:
-            dialect = csv.Sniffer().sniff(sample, delimiters=",\t")
-            delimiter = dialect.delimiter
-        except csv.Error:
-            delimiter = "\t" if "\t" in sample else ","
+        delimiter = "\t" if "\t" in sample else ","
 
-        reader = csv.DictReader(f, delimiter=delimiter)
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, [])
+        name_indices = _column_indices(header, name_keys)
+        repo_indices = _column_indices(header, repo_keys)
         for row in reader:
-            name_val = _first_non_empty(row, name_keys)
-            repo_val = _first_non_empty(row, repo_keys)
+            name_val = _first_non_empty(row, name_indices)
+            repo_val = _first_non_empty(row, repo_indices)
             if not repo_val:
                 # fall back to any field that looks like a GitHub URL
-                for val in row.values():
+                for val in row:
                     if val and "github.com" in val:
                         repo_val = val.strip()
                         break
@@ -151,10 +133,12 @@ def main() -> int:
 
     rows = []
     with args.repos.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        repo_indices = _column_indices(header, ("repo_url", "repo"))
+        name_indices = _column_indices(header, ("team_name", "Team Name", "team", "name", "id"))
         for idx, row in enumerate(reader, start=2):  # start=2 accounts for header line
-            repo_val = row.get("repo_url") or row.get("repo") or ""
-            repo_val = repo_val.strip()
+            repo_val = _first_non_empty(row, repo_indices)
             if not repo_val:
                 continue
             try:
@@ -162,7 +146,7 @@ def main() -> int:
             except ValueError as exc:
                 sys.stderr.write(f"Skipping row {idx}: {exc}\n")
                 continue
-            team_name = repo_name_map.get(slug) or derive_team_name(row, slug)
+            team_name = repo_name_map.get(slug) or derive_team_name(row, name_indices, slug)
             rows.append((team_name, clone_url))
 
     for idx, (team, repo_url) in enumerate(rows, start=1):
@@ -1,51 +1,52 @@
 from __future__ import annotations
 
+import csv
 import json
 import re
+import sys
 from collections import defaultdict
 from difflib import get_close_matches
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import pandas as pd
-
 
 RAW_RESPONSES_PATH = Path("data/judge-responses-raw.csv")
 PROJECT_MAP_PATH = Path("data/project-repo-map.csv")
 OUTPUT_PATH = Path("data/judge-responses-normalized.json")
 
+URL_RE = re.compile(r"https?://[^\s,]+")
+
 
 def clean_project_name(name: str) -> str:
     """Normalize project names for matching."""
-    normalized = re.sub(r"\s+", " ", str(name).strip())
-    return normalized.lower()
+    return sys.intern(" ".join(str(name).split()).lower())
 
 
 def extract_first_url(text: str) -> Optional[str]:
     """Return the first URL from the provided text, if any."""
     if not isinstance(text, str):
         return None
-    match = re.search(r"https?://[^\s,]+", text)
+    match = URL_RE.search(text)
     return match.group(0).strip() if match else None
 
 
 def load_project_repo_map() -> Dict[str, str]:
     """Load the project->repo map, cleaning names and urls."""
-    df = pd.read_csv(
-        PROJECT_MAP_PATH, sep="\\t", header=None, names=["Project", "Repo"], engine="python"
-    )
     mapping: Dict[str, str] = {}
-    for _, row in df.iterrows():
-        project_raw = row["Project"]
-        repo_raw = row["Repo"]
-
-        # Skip header row and entries without a usable URL.
-        repo_url = extract_first_url(repo_raw)
-        if not repo_url:
-            continue
-
-        project_key = clean_project_name(project_raw)
-        mapping[project_key] = repo_url
+    with PROJECT_MAP_PATH.open(newline="", encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter="\t"):
+            if len(row) < 2:
+                continue
+            project_raw, repo_raw = row[0], row[1]
+
+            # Skip header row and entries without a usable URL.
+            repo_url = extract_first_url(repo_raw)
+            if not repo_url:
+                continue
+
+            project_key = clean_project_name(project_raw)
+            mapping[project_key] = repo_url
     return mapping
 
 
@@ -71,6 +72,7 @@ def resolve_project_repo(
     project_clean: str,
     mapping: Dict[str, str],
     aliases: Dict[str, str],
+    candidates: List[str],
 ) -> Optional[str]:
     """Find the repo URL for a cleaned project name."""
     if project_clean in mapping:
@@ -81,7 +83,7 @@ def resolve_project_repo(
         return mapping.get(target)
 
     # Conservative fuzzy match to catch small differences.
-    close = get_close_matches(project_clean, mapping.keys(), n=1, cutoff=0.9)
+    close = get_close_matches(project_clean, candidates, n=1, cutoff=0.9)
     if close:
         return mapping[close[0]]
 
@@ -90,9 +92,13 @@ def resolve_project_repo(
 
 def normalize_responses() -> Dict[str, dict]:
     project_repo_map = load_project_repo_map()
-    aliases = build_manual_aliases(list(project_repo_map.keys()))
+    project_keys = list(project_repo_map.keys())
+    aliases = build_manual_aliases(project_keys)
+    # Judges score the same project many times; resolve each cleaned name only once.
+    resolve = lru_cache(maxsize=None)(
+        partial(resolve_project_repo, mapping=project_repo_map, aliases=aliases, candidates=project_keys)
+    )
 
-    responses = pd.read_csv(RAW_RESPONSES_PATH)
     normalized: Dict[str, dict] = {}
     unmapped: List[dict] = []
 
@@ -100,23 +106,26 @@ def normalize_responses() -> Dict[str, dict]:
         lambda: {"project": None, "responses": [], "raw_project_names": set()}
     )
 
-    for _, row in responses.iterrows():
-        project_raw = row["Project"]
-        project_clean = clean_project_name(project_raw)
-        repo_url = resolve_project_repo(project_clean, project_repo_map, aliases)
-        entry = {
-            "timestamp": row["Timestamp"],
-            "score": int(row["Score"]),
-            "thoughts": row["Thoughts"] if not (pd.isna(row["Thoughts"])) else None,
-        }
-
-        if repo_url:
-            agg = aggregator[repo_url]
-            agg["project"] = agg["project"] or project_raw.strip()
-            agg["raw_project_names"].add(project_raw.strip())
-            agg["responses"].append(entry)
-        else:
-            unmapped.append({"project": project_raw.strip(), **entry})
+    with RAW_RESPONSES_PATH.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            project_raw = row["Project"]
+            # The same project is scored by many judges; intern so repeats share one string.
+            project_name = sys.intern(project_raw.strip())
+            project_clean = clean_project_name(project_raw)
+            repo_url = resolve(project_clean)
+            entry = {
+                "timestamp": row["Timestamp"],
+                "score": int(row["Score"]),
+                "thoughts": row["Thoughts"] or None,
+            }
+
+            if repo_url:
+                agg = aggregator[repo_url]
+                agg["project"] = agg["project"] or project_name
+                agg["raw_project_names"].add(project_name)
+                agg["responses"].append(entry)
+            else:
+                unmapped.append({"project": project_name, **entry})
 
     for repo_url, data in aggregator.items():
         scores = [resp["score"] for resp in data["responses"]]
@@ -7,22 +7,48 @@ import argparse
 import csv
 import json
 import logging
+import multiprocessing
 import os
+import re
 import subprocess
-from datetime import datetime, timezone
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from statistics import median
-from typing import Dict, List, Optional, Tuple
+from typing import IO, AnyStr, Dict, Iterator, List, Optional, Tuple
+
+from ai._common import parse_repo_url
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used when it is not installed
+    orjson = None
 
 BULK_INSERTION_THRESHOLD = 1000
 BULK_FILES_THRESHOLD = 50
 
+# Event time-distribution buckets and their upper bounds in hours since T0; the last bucket is open-ended.
+TIME_BUCKET_KEYS = ("commits_0_3h", "commits_3_6h", "commits_6_12h", "commits_12_24h", "commits_after_24h")
+TIME_BUCKET_BOUNDS = (3, 6, 12, 24)
+
+# With --trim-pre-t0, history older than T0 minus this margin is counted but not parsed.
+PRE_T0_HISTORY_MARGIN = timedelta(hours=24)
+
+# git log --shortstat summary line, e.g. " 3 files changed, 10 insertions(+), 2 deletions(-)".
+SHORTSTAT_RE = re.compile(rb"(\d+) files? changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?")
+
 
 def parse_iso_datetime(value: str) -> datetime:
     """Parse ISO datetime string and ensure timezone-aware (default UTC)."""
     if value.endswith("Z"):
         value = value[:-1] + "+00:00"
     dt = datetime.fromisoformat(value)
+    if dt.tzinfo is timezone.utc:
+        # fromisoformat is C-implemented; the astimezone() conversion is the costly part, so
+        # skip it for values that are already UTC (git log dates are requested in UTC).
+        return dt
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
@@ -73,6 +99,29 @@ def run_git_command(repo_dir: Path, args: List[str]) -> subprocess.CompletedProc
     return subprocess.run(cmd, capture_output=True, text=True)
 
 
+def open_git_stream(
+    repo_dir: Path, args: List[str], stderr: IO[bytes], env: Optional[Dict[str, str]] = None
+) -> subprocess.Popen:
+    """Start a git command whose stdout (bytes) is consumed while git is still running.
+
+    stderr must be a file, not a pipe: nothing reads it until stdout is drained, so a full
+    stderr pipe would block git while we block on stdout.
+    """
+    cmd = ["git", "-C", str(repo_dir)] + args
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, env=env)
+
+
+def iter_records(stream: IO[AnyStr], separator: AnyStr, chunk_size: int = 65536) -> Iterator[AnyStr]:
+    """Yield separator-delimited records from a stream without reading it all into memory."""
+    pending = separator[:0]
+    for chunk in iter(lambda: stream.read(chunk_size), separator[:0]):
+        pending += chunk
+        *records, pending = pending.split(separator)
+        yield from records
+    if pending:
+        yield pending
+
+
 def get_default_branch(repo_dir: Path) -> str:
     result = run_git_command(repo_dir, ["symbolic-ref", "--short", "refs/remotes/origin/HEAD"])
     if result.returncode == 0:
@@ -85,208 +134,171 @@ def get_default_branch(repo_dir: Path) -> str:
     return result.stdout.strip()
 
 
-def parse_repo_url(raw: str) -> Tuple[str, str]:
-    """
-    Normalize a repo URL/slug to (owner/repo slug, clone_url candidate).
-    Accepts GitHub page URL, HTTPS .git, SSH git@github.com:owner/repo.git, or slug owner/repo.
-    """
-    if not raw:
-        raise ValueError("Empty repo URL")
-    trimmed = raw.strip()
-    if trimmed.startswith("git@github.com:"):
-        path_part = trimmed.split(":", 1)[1]
-    elif "://" in trimmed:
-        # Strip scheme/host
-        after_scheme = trimmed.split("://", 1)[1]
-        # Remove possible username@host/
-        if "/" in after_scheme:
-            path_part = after_scheme.split("/", 1)[1]
-        else:
-            raise ValueError(f"Could not parse repo URL: {raw}")
-    else:
-        path_part = trimmed
+def get_head_sha(repo_dir: Path, ref: str = "HEAD") -> str:
+    result = run_git_command(repo_dir, ["rev-parse", ref])
+    result.check_returncode()
+    return result.stdout.strip()
+
 
-    path_part = path_part.strip("/")
-    if path_part.endswith(".git"):
-        path_part = path_part[:-4]
-    parts = path_part.split("/")
-    if len(parts) < 2:
-        raise ValueError(f"Could not extract owner/repo from: {raw}")
-    owner, repo = parts[0], parts[1]
-    slug = f"{owner}/{repo}"
-    clone_url = raw if ("://" in trimmed or trimmed.startswith("git@")) else f"https://github.com/{slug}.git"
-    return slug, clone_url
+def resolve_clone_url(repo_spec: str) -> str:
+    if "://" in repo_spec or repo_spec.startswith("git@"):
+        return repo_spec
+    return f"https://github.com/{repo_spec}.git"
 
 
-def ensure_cloned(repo_id: str, repo_spec: str, repos_root: Path, update: bool = True) -> Path:
+def ensure_cloned(
+    repo_id: str, repo_spec: str, repos_root: Path, update: bool = True
+) -> Tuple[Path, str]:
+    """Clone or refresh the repo; returns its directory and default branch."""
     repo_dir = repos_root / repo_id
     if not repo_dir.exists():
-        if "://" in repo_spec:
-            clone_url = repo_spec
-        else:
-            clone_url = f"https://github.com/{repo_spec}.git"
+        clone_url = resolve_clone_url(repo_spec)
         result = subprocess.run(["git", "clone", clone_url, str(repo_dir)], capture_output=True, text=True)
         if result.returncode != 0:
             raise RuntimeError(f"git clone failed for {repo_id}: {result.stderr.strip()}")
-    else:
-        if update:
-            fetch = run_git_command(repo_dir, ["fetch", "--all", "--prune"])
-            if fetch.returncode != 0:
-                raise RuntimeError(f"git fetch failed for {repo_id}: {fetch.stderr.strip()}")
-            default_branch = get_default_branch(repo_dir)
-            checkout = run_git_command(repo_dir, ["checkout", default_branch])
-            if checkout.returncode != 0:
-                raise RuntimeError(f"git checkout failed for {repo_id}: {checkout.stderr.strip()}")
-            reset = run_git_command(repo_dir, ["reset", "--hard", f"origin/{default_branch}"])
-            if reset.returncode != 0:
-                raise RuntimeError(f"git reset failed for {repo_id}: {reset.stderr.strip()}")
-    return repo_dir
-
-
-def collect_commit_data(repo_dir: Path, default_branch: str) -> List[Dict]:
+        return repo_dir, get_default_branch(repo_dir)
+
+    if not update:
+        return repo_dir, get_default_branch(repo_dir)
+
+    fetch = run_git_command(repo_dir, ["fetch", "--all", "--prune"])
+    if fetch.returncode != 0:
+        raise RuntimeError(f"git fetch failed for {repo_id}: {fetch.stderr.strip()}")
+    default_branch = get_default_branch(repo_dir)
     checkout = run_git_command(repo_dir, ["checkout", default_branch])
     if checkout.returncode != 0:
-        raise RuntimeError(f"git checkout {default_branch} failed: {checkout.stderr.strip()}")
+        raise RuntimeError(f"git checkout failed for {repo_id}: {checkout.stderr.strip()}")
+    reset = run_git_command(repo_dir, ["reset", "--hard", f"origin/{default_branch}"])
+    if reset.returncode != 0:
+        raise RuntimeError(f"git reset failed for {repo_id}: {reset.stderr.strip()}")
+    return repo_dir, default_branch
+
+
+def count_commits_before(repo_dir: Path, ref: str, before: datetime) -> int:
+    result = run_git_command(repo_dir, ["rev-list", "--count", f"--before={before.isoformat()}", ref, "--"])
+    if result.returncode != 0:
+        raise RuntimeError(f"git rev-list failed: {result.stderr.strip()}")
+    return int(result.stdout.strip())
+
+
+def collect_commit_data(repo_dir: Path, default_branch: str, since: Optional[datetime] = None) -> List[Dict]:
+    # -z separates commits with NUL, so each record is "<header>[\n<shortstat line>]" and
+    # commits without a stat line (merges, empty commits) cannot run into the next one.
     log_cmd = [
         "log",
         "--reverse",
-        "--pretty=format:%H%x1f%aI%x1f%an%x1f%ae%x1f%P%x1f%s",
-        "--numstat",
+        "-z",
+        # Author dates rendered in UTC (TZ=UTC below) so parse_iso_datetime can skip the tz conversion.
+        "--date=format-local:%Y-%m-%dT%H:%M:%S+00:00",
+        "--pretty=format:%H%x1f%ad%x1f%an%x1f%ae%x1f%P%x1f%s",
+        "--shortstat",
+        *([f"--since={since.isoformat()}"] if since else []),
+        # Log the branch itself rather than checking it out first; "--" keeps it from being read as a path.
+        default_branch,
+        "--",
     ]
-    result = run_git_command(repo_dir, log_cmd)
-    if result.returncode != 0:
-        raise RuntimeError(f"git log failed: {result.stderr.strip()}")
-
     commits: List[Dict] = []
-    current: Optional[Dict] = None
-
-    for line in result.stdout.splitlines():
-        if not line.strip():
-            if current is not None:
-                commits.append(current)
-                current = None
-            continue
-        if current is None:
-            parts = line.split("\x1f")
-            if len(parts) != 6:
-                raise RuntimeError("Unexpected git log format")
-            sha, author_iso, author_name, author_email, parents_raw, subject = parts
-            parents = parents_raw.split() if parents_raw.strip() else []
-            current = {
-                "sha": sha,
-                "author_time": parse_iso_datetime(author_iso),
-                "author_name": author_name,
-                "author_email": author_email,
-                "parents": parents,
-                "is_merge": len(parents) > 1,
-                "subject": subject,
-                "insertions": 0,
-                "deletions": 0,
-                "files_changed": 0,
-            }
-            continue
-        fields = line.split("\t")
-        if len(fields) != 3:
-            continue
-        ins_raw, del_raw, _path = fields
-        insertions = int(ins_raw) if ins_raw.isdigit() else 0
-        deletions = int(del_raw) if del_raw.isdigit() else 0
-        current["insertions"] += insertions
-        current["deletions"] += deletions
-        current["files_changed"] += 1
-
-    if current is not None:
-        commits.append(current)
+
+    with tempfile.TemporaryFile() as err:
+        with open_git_stream(repo_dir, log_cmd, err, env={**os.environ, "TZ": "UTC"}) as proc:
+            # Records stay bytes: the delimiters are ASCII, so only the text fields are decoded.
+            for record in iter_records(proc.stdout, b"\x00"):
+                header, _, stat_line = record.strip(b"\n").partition(b"\n")
+                parts = header.split(b"\x1f", 5)
+                if len(parts) != 6:
+                    raise RuntimeError("Unexpected git log format")
+                sha, author_iso, author_name, author_email, parents_raw, subject = parts
+                parents = parents_raw.decode("ascii").split()
+                stat = SHORTSTAT_RE.search(stat_line)
+                files_raw, ins_raw, del_raw = stat.groups() if stat else (None, None, None)
+                commits.append(
+                    {
+                        "sha": sha.decode("ascii"),
+                        "author_time": parse_iso_datetime(author_iso.decode("ascii")),
+                        "author_name": author_name.decode("utf-8", "replace"),
+                        "author_email": author_email.decode("utf-8", "replace"),
+                        "parents": parents,
+                        "is_merge": len(parents) > 1,
+                        "subject": subject.decode("utf-8", "replace"),
+                        "insertions": int(ins_raw) if ins_raw else 0,
+                        "deletions": int(del_raw) if del_raw else 0,
+                        "files_changed": int(files_raw) if files_raw else 0,
+                    }
+                )
+        # Leaving the Popen block waited for git, so the return code is set.
+        if proc.returncode != 0:
+            err.seek(0)
+            stderr = err.read().decode("utf-8", "replace")
+            raise RuntimeError(f"git log failed: {stderr.strip()}")
     return commits
 
 
-def compute_metrics(commits: List[Dict], t0: datetime, t1: Optional[datetime]) -> Dict:
-    commits_enriched = []
+def classify_commit_time(author_time: datetime, t0: datetime, t1: Optional[datetime]) -> Tuple[bool, bool, bool]:
+    """Return (is_before_t0, is_during_event, is_after_t1) for a commit timestamp."""
+    if t1:
+        return author_time < t0, t0 <= author_time <= t1, author_time > t1
+    return author_time < t0, author_time >= t0, False
+
+
+def is_bulk_commit(commit: Dict) -> bool:
+    return (
+        commit["insertions"] >= BULK_INSERTION_THRESHOLD
+        or commit["files_changed"] >= BULK_FILES_THRESHOLD
+    )
+
+
+def compute_summary_metrics(commits: List[Dict], t0: datetime, t1: Optional[datetime]) -> Dict:
+    """Aggregate repo-level metrics without materializing per-commit rows (see iter_commit_lines)."""
     minutes_between_all = []
     minutes_between_event = []
+    bucket_counts = [0] * len(TIME_BUCKET_KEYS)
+    prev_time: Optional[datetime] = None
     event_prev_time: Optional[datetime] = None
-
-    for idx, commit in enumerate(commits):
-        prev_time = commits[idx - 1]["author_time"] if idx > 0 else None
-        minutes_since_prev = None
+    total_commits_before_t0 = 0
+    total_commits_during_event = 0
+    total_commits_after_t1 = 0
+    total_loc_added = 0
+    total_loc_deleted = 0
+    max_loc_added_single_commit = 0
+    max_files_changed_single_commit = 0
+    has_bulk_commits = False
+    has_large_initial_commit_after_t0 = False
+    has_merge_commits = False
+
+    for commit in commits:
+        author_time = commit["author_time"]
         if prev_time:
-            minutes_since_prev = (commit["author_time"] - prev_time).total_seconds() / 60.0
-            minutes_between_all.append(minutes_since_prev)
-
-        if t1:
-            is_during = t0 <= commit["author_time"] <= t1
-            is_after_t1 = commit["author_time"] > t1
-        else:
-            is_during = commit["author_time"] >= t0
-            is_after_t1 = False
-        is_before_t0 = commit["author_time"] < t0
-
-        if is_during and event_prev_time:
-            minutes_between_event.append(
-                (commit["author_time"] - event_prev_time).total_seconds() / 60.0
-            )
-        if is_during:
-            event_prev_time = commit["author_time"]
+            minutes_between_all.append((author_time - prev_time).total_seconds() / 60.0)
+        prev_time = author_time
 
-        flag_bulk = (
-            commit["insertions"] >= BULK_INSERTION_THRESHOLD
-            or commit["files_changed"] >= BULK_FILES_THRESHOLD
-        )
+        is_before_t0, is_during, is_after_t1 = classify_commit_time(author_time, t0, t1)
 
-        commits_enriched.append(
-            {
-                **commit,
-                "minutes_since_prev_commit": minutes_since_prev,
-                "minutes_since_t0": (commit["author_time"] - t0).total_seconds() / 60.0,
-                "is_before_t0": is_before_t0,
-                "is_during_event": is_during,
-                "is_after_t1": is_after_t1,
-                "flag_bulk_commit": flag_bulk,
-            }
-        )
+        if is_during:
+            flag_bulk = is_bulk_commit(commit)
+            if event_prev_time:
+                minutes_between_event.append((author_time - event_prev_time).total_seconds() / 60.0)
+            else:
+                has_large_initial_commit_after_t0 = flag_bulk
+            event_prev_time = author_time
+            hours = (author_time - t0).total_seconds() / 3600.0
+            bucket_counts[bisect_right(TIME_BUCKET_BOUNDS, hours)] += 1
+            has_bulk_commits = has_bulk_commits or flag_bulk
+        has_merge_commits = has_merge_commits or commit["is_merge"]
+
+        total_commits_before_t0 += is_before_t0
+        total_commits_during_event += is_during
+        total_commits_after_t1 += is_after_t1
+        total_loc_added += commit["insertions"]
+        total_loc_deleted += commit["deletions"]
+        max_loc_added_single_commit = max(max_loc_added_single_commit, commit["insertions"])
+        max_files_changed_single_commit = max(max_files_changed_single_commit, commit["files_changed"])
 
     def safe_median(values: List[float]) -> Optional[float]:
         return median(values) if values else None
 
-    total_commits = len(commits_enriched)
-    total_commits_before_t0 = sum(1 for c in commits_enriched if c["is_before_t0"])
-    total_commits_during_event = sum(1 for c in commits_enriched if c["is_during_event"])
-    total_commits_after_t1 = sum(1 for c in commits_enriched if c["is_after_t1"])
-
-    total_loc_added = sum(c["insertions"] for c in commits_enriched)
-    total_loc_deleted = sum(c["deletions"] for c in commits_enriched)
-    max_loc_added_single_commit = max((c["insertions"] for c in commits_enriched), default=0)
-    max_files_changed_single_commit = max((c["files_changed"] for c in commits_enriched), default=0)
-
-    buckets = {
-        "commits_0_3h": 0,
-        "commits_3_6h": 0,
-        "commits_6_12h": 0,
-        "commits_12_24h": 0,
-        "commits_after_24h": 0,
-    }
-
-    for c in commits_enriched:
-        if not c["is_during_event"]:
-            continue
-        hours = (c["author_time"] - t0).total_seconds() / 3600.0
-        if 0 <= hours < 3:
-            buckets["commits_0_3h"] += 1
-        elif 3 <= hours < 6:
-            buckets["commits_3_6h"] += 1
-        elif 6 <= hours < 12:
-            buckets["commits_6_12h"] += 1
-        elif 12 <= hours < 24:
-            buckets["commits_12_24h"] += 1
-        elif hours >= 24:
-            buckets["commits_after_24h"] += 1
-
-    first_during = next((c for c in commits_enriched if c["is_during_event"]), None)
-    has_large_initial_commit_after_t0 = bool(first_during and first_during["flag_bulk_commit"])
-
     metrics = {
         "summary": {
-            "total_commits": total_commits,
+            "total_commits": len(commits),
             "total_commits_before_t0": total_commits_before_t0,
             "total_commits_during_event": total_commits_during_event,
             "total_commits_after_t1": total_commits_after_t1,
@@ -297,21 +309,50 @@ def compute_metrics(commits: List[Dict], t0: datetime, t1: Optional[datetime]) -
             "median_minutes_between_commits": safe_median(minutes_between_all),
             "median_minutes_between_commits_during_event": safe_median(minutes_between_event),
         },
-        "time_distribution": buckets,
+        "time_distribution": dict(zip(TIME_BUCKET_KEYS, bucket_counts)),
         "flags": {
             "has_commits_before_t0": total_commits_before_t0 > 0,
-            "has_bulk_commits": any(
-                c["flag_bulk_commit"] and c["is_during_event"] for c in commits_enriched
-            ),
+            "has_bulk_commits": has_bulk_commits,
             "has_large_initial_commit_after_t0": has_large_initial_commit_after_t0,
-            "has_merge_commits": any(c["is_merge"] for c in commits_enriched),
+            "has_merge_commits": has_merge_commits,
         },
-        "commits": commits_enriched,
     }
     return metrics
 
 
-def write_commit_csv(path: Path, repo_id: str, commits: List[Dict]) -> None:
+def csv_field(value: str) -> str:
+    """Quote a text field exactly as csv.writer's default dialect (QUOTE_MINIMAL) would."""
+    if '"' in value or "," in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def iter_commit_lines(repo_id: str, commits: List[Dict], t0: datetime, t1: Optional[datetime]) -> Iterator[str]:
+    """Yield one formatted per-commit CSV line at a time, deriving the per-commit fields on the fly.
+
+    Only repo_id and the subject can need quoting, so lines are built with a single f-string
+    instead of passing every numeric field through csv.writer.
+    """
+    repo_field = csv_field(repo_id)
+    prev_time: Optional[datetime] = None
+    for idx, c in enumerate(commits):
+        author_time = c["author_time"]
+        is_before_t0, is_during, is_after_t1 = classify_commit_time(author_time, t0, t1)
+        minutes_since_prev = f"{(author_time - prev_time).total_seconds() / 60.0:.2f}" if prev_time else ""
+        yield (
+            f"{repo_field},{idx},{c['sha']},{author_time.isoformat()},{minutes_since_prev},"
+            f"{(author_time - t0).total_seconds() / 60.0:.2f},"
+            f"{c['insertions']},{c['deletions']},{c['files_changed']},"
+            f"{1 if c['is_merge'] else 0},{1 if is_before_t0 else 0},{1 if is_during else 0},"
+            f"{1 if is_after_t1 else 0},{1 if is_bulk_commit(c) else 0},"
+            f"{csv_field(c['subject'])}\r\n"
+        )
+        prev_time = author_time
+
+
+def write_commit_csv(
+    path: Path, repo_id: str, commits: List[Dict], t0: datetime, t1: Optional[datetime]
+) -> None:
     fieldnames = [
         "repo_id",
         "seq_index",
@@ -330,32 +371,8 @@ def write_commit_csv(path: Path, repo_id: str, commits: List[Dict]) -> None:
         "subject",
     ]
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for idx, c in enumerate(commits):
-            writer.writerow(
-                {
-                    "repo_id": repo_id,
-                    "seq_index": idx,
-                    "sha": c["sha"],
-                    "author_time_iso": c["author_time"].isoformat(),
-                    "minutes_since_prev_commit": (
-                        f"{c['minutes_since_prev_commit']:.2f}"
-                        if c["minutes_since_prev_commit"] is not None
-                        else ""
-                    ),
-                    "minutes_since_t0": f"{c['minutes_since_t0']:.2f}",
-                    "insertions": c["insertions"],
-                    "deletions": c["deletions"],
-                    "files_changed": c["files_changed"],
-                    "is_merge": 1 if c["is_merge"] else 0,
-                    "is_before_t0": 1 if c["is_before_t0"] else 0,
-                    "is_during_event": 1 if c["is_during_event"] else 0,
-                    "is_after_t1": 1 if c["is_after_t1"] else 0,
-                    "flag_bulk_commit": 1 if c["flag_bulk_commit"] else 0,
-                    "subject": c["subject"],
-                }
-            )
+        csv.writer(f).writerow(fieldnames)
+        f.writelines(iter_commit_lines(repo_id, commits, t0, t1))
 
 
 def write_metrics_json(
@@ -364,15 +381,18 @@ def write_metrics_json(
     repo_spec: str,
     remote_url: str,
     default_branch: str,
+    head_sha: str,
     t0: datetime,
     t1: Optional[datetime],
     metrics: Dict,
+    history_since: Optional[datetime] = None,
 ) -> None:
     output = {
         "repo_id": repo_id,
         "repo": repo_spec,
         "remote_url": remote_url,
         "default_branch": default_branch,
+        "head_sha": head_sha,
         "t0": t0.isoformat(),
         "t1": t1.isoformat() if t1 else None,
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -380,8 +400,14 @@ def write_metrics_json(
         "time_distribution": metrics["time_distribution"],
         "flags": metrics["flags"],
     }
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    if history_since:
+        output["history_since"] = history_since.isoformat()
+    if orjson is not None:
+        data = orjson.dumps(output, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(output, indent=2).encode("utf-8")
+    with path.open("wb") as f:
+        f.write(data)
 
 
 def write_summary_csv(path: Path, rows: List[Dict]) -> None:
@@ -412,19 +438,19 @@ def write_summary_csv(path: Path, rows: List[Dict]) -> None:
         "has_merge_commits",
     ]
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            cleaned = {k: ("" if v is None else v) for k, v in row.items()}
-            writer.writerow(cleaned)
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        # csv.writer already writes None as an empty field.
+        writer.writerows([row[k] for k in fieldnames] for row in rows)
 
 
-def load_repos_csv(path: Path) -> List[Dict]:
+def load_repos_csv(path: Path) -> Iterator[Dict]:
+    """Yield normalized repo rows from the repos CSV as they are read."""
     with path.open(newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
-        rows = []
+        has_repo_url = "repo_url" in (reader.fieldnames or [])
         for row in reader:
-            if "repo_url" in reader.fieldnames:
+            if has_repo_url:
                 repo_raw = row.get("repo_url", "").strip()
                 if not repo_raw:
                     continue
@@ -433,26 +459,21 @@ def load_repos_csv(path: Path) -> List[Dict]:
                 except ValueError:
                     continue
                 repo_id = row.get("id", "").strip() or slug.replace("/", "-")
-                rows.append(
-                    {
-                        "repo_id": repo_id,
-                        "repo_spec": clone_url if clone_url else slug,
-                        "slug": slug,
-                        "t0": row.get("t0", "").strip(),
-                    }
-                )
+                yield {
+                    "repo_id": repo_id,
+                    "repo_spec": clone_url if clone_url else slug,
+                    "slug": slug,
+                    "t0": row.get("t0", "").strip(),
+                }
             else:
                 if not row.get("id") or not row.get("repo"):
                     continue
-                rows.append(
-                    {
-                        "repo_id": row["id"].strip(),
-                        "repo_spec": row["repo"].strip(),
-                        "slug": row["repo"].strip(),
-                        "t0": row.get("t0", "").strip(),
-                    }
-                )
-        return rows
+                yield {
+                    "repo_id": row["id"].strip(),
+                    "repo_spec": row["repo"].strip(),
+                    "slug": row["repo"].strip(),
+                    "t0": row.get("t0", "").strip(),
+                }
 
 
 def build_summary_row(repo_id: str, repo_spec: str, default_branch: str, metrics: Dict) -> Dict:
@@ -489,6 +510,159 @@ def build_summary_row(repo_id: str, repo_spec: str, default_branch: str, metrics
     }
 
 
+def analyze_repo(
+    repo_id: str,
+    repo_spec: str,
+    repo_dir: Path,
+    default_branch: str,
+    head_sha: str,
+    t0: datetime,
+    t1: Optional[datetime],
+    metrics_json_path: Path,
+    commits_csv_path: Path,
+    history_since: Optional[datetime] = None,
+) -> Tuple[Dict, int]:
+    """Parse history and write the per-repo outputs; returns (metrics, commit count).
+
+    Runs in a worker process, so it takes only picklable arguments and does not log.
+    When history_since is set, older commits are only counted (as before T0 and in the
+    total); LOC, medians and the commits CSV cover the parsed range only.
+    """
+    commits = collect_commit_data(repo_dir, default_branch, since=history_since)
+    metrics = compute_summary_metrics(commits, t0, t1)
+    if history_since:
+        # git's --since keeps commits dated >= history_since, so count strictly older ones.
+        skipped = count_commits_before(repo_dir, default_branch, history_since - timedelta(seconds=1))
+        summary = metrics["summary"]
+        summary["total_commits"] += skipped
+        summary["total_commits_before_t0"] += skipped
+        metrics["flags"]["has_commits_before_t0"] = summary["total_commits_before_t0"] > 0
+    write_commit_csv(commits_csv_path, repo_id, commits, t0, t1)
+    write_metrics_json(
+        metrics_json_path,
+        repo_id,
+        repo_spec,
+        resolve_clone_url(repo_spec),
+        default_branch,
+        head_sha,
+        t0,
+        t1,
+        metrics,
+        history_since,
+    )
+    return metrics, len(commits)
+
+
+def process_repo(
+    row: Dict,
+    dirs: Dict[str, Path],
+    global_t0: datetime,
+    global_t1: Optional[datetime],
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    analyze_pool: Executor,
+) -> Optional[Dict]:
+    """Clone/refresh one repo and compute its metrics; returns its summary row, or None on error.
+
+    Cloning runs in the calling thread; the CPU-bound analysis is handed to analyze_pool.
+    """
+    repo_id = row["repo_id"]
+    repo_spec = row["repo_spec"]
+    t0_value = row.get("t0", "")
+    try:
+        repo_t0 = parse_iso_datetime(t0_value) if t0_value else global_t0
+    except Exception as exc:
+        logger.error("Invalid t0 for repo %s: %s", repo_id, exc)
+        return None
+    repo_t1 = global_t1
+    history_since = repo_t0 - PRE_T0_HISTORY_MARGIN if args.trim_pre_t0 else None
+
+    metrics_json_path = dirs["metrics"] / f"{repo_id}.json"
+    commits_csv_path = dirs["metrics"] / f"{repo_id}_commits.csv"
+
+    metrics_data = None
+    default_branch = None
+    cached = None
+
+    if metrics_json_path.exists():
+        try:
+            with metrics_json_path.open("r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except Exception as exc:
+            logger.error("Failed to load cached metrics for %s: %s", repo_id, exc)
+            if not args.force:
+                return None
+
+    if cached is not None and not args.force:
+        logger.info("Skipping %s (cached metrics found).", repo_id)
+        metrics_data = cached
+        default_branch = cached.get("default_branch")
+    else:
+        try:
+            repo_dir, default_branch = ensure_cloned(
+                repo_id, repo_spec, dirs["repos"], update=not args.no_update
+            )
+            head_sha = get_head_sha(repo_dir, default_branch)
+            if (
+                cached is not None
+                and cached.get("head_sha") == head_sha
+                and cached.get("default_branch") == default_branch
+                and cached.get("t0") == repo_t0.isoformat()
+                and cached.get("t1") == (repo_t1.isoformat() if repo_t1 else None)
+                and cached.get("history_since") == (history_since.isoformat() if history_since else None)
+                and commits_csv_path.exists()
+            ):
+                # Same history and window as the cached run, so the metrics would be identical.
+                logger.info("Reusing cached metrics for %s (HEAD %s unchanged).", repo_id, head_sha[:12])
+                metrics_data = cached
+            else:
+                metrics, commit_count = analyze_pool.submit(
+                    analyze_repo,
+                    repo_id,
+                    repo_spec,
+                    repo_dir,
+                    default_branch,
+                    head_sha,
+                    repo_t0,
+                    repo_t1,
+                    metrics_json_path,
+                    commits_csv_path,
+                    history_since,
+                ).result()
+                metrics_data = {
+                    **metrics,
+                    "repo_id": repo_id,
+                    "repo": repo_spec,
+                    "default_branch": default_branch,
+                    "t0": repo_t0.isoformat(),
+                    "t1": repo_t1.isoformat() if repo_t1 else None,
+                }
+                logger.info("Processed %s with %d commits.", repo_id, commit_count)
+        except Exception as exc:
+            logger.error("Failed processing %s: %s", repo_id, exc)
+            return None
+
+    if not metrics_data:
+        return None
+    return build_summary_row(repo_id, repo_spec, default_branch or "", metrics_data)
+
+
+def process_repo_rows(
+    indexed_rows: List[Tuple[int, Dict]],
+    dirs: Dict[str, Path],
+    global_t0: datetime,
+    global_t1: Optional[datetime],
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    analyze_pool: Executor,
+) -> List[Tuple[int, Optional[Dict]]]:
+    """Process CSV rows sharing one repo_id in CSV order, since they share a clone and output files."""
+    return [
+        (idx, process_repo(row, dirs, global_t0, global_t1, args, logger, analyze_pool))
+        for idx, row in indexed_rows
+    ]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Hackathon GitHub Repo Analyzer")
     parser.add_argument("--repos", required=True, help="Path to repos CSV")
@@ -496,8 +670,26 @@ def main() -> None:
     parser.add_argument("--t0", help="Global hackathon start time (ISO-8601). Overrides config if set.")
     parser.add_argument("--t1", help="Hackathon end time (ISO-8601). Overrides config if set.")
     parser.add_argument("--work-dir", default="work", help="Work directory base path")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Refresh repos even if metrics exist; recompute unless HEAD and t0/t1 are unchanged",
+    )
     parser.add_argument("--no-update", action="store_true", help="Do not fetch/pull existing clones")
     parser.add_argument("--log-level", help="Logging level (overrides config)")
+    parser.add_argument(
+        "--trim-pre-t0",
+        action="store_true",
+        help=(
+            "Only parse history from 24h before t0; older commits are counted but excluded from "
+            "LOC totals, medians and the commits CSV"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of repos to clone/analyze in parallel (min 1; default: min(32, 4 x CPU count))",
+    )
     args = parser.parse_args()
 
     config = load_config(Path(args.config)) if args.config else {}
@@ -529,75 +721,36 @@ def main() -> None:
     if not repos_csv.exists():
         logger.error("Repos CSV not found: %s", repos_csv)
         return
-    rows = load_repos_csv(repos_csv)
-    if not rows:
+    # Rows are grouped by repo_id: duplicates must not clone/fetch/write the same paths concurrently.
+    rows_by_id: Dict[str, List[Tuple[int, Dict]]] = {}
+    row_count = 0
+    for row_count, row in enumerate(load_repos_csv(repos_csv), start=1):
+        rows_by_id.setdefault(row["repo_id"], []).append((row_count - 1, row))
+    if not rows_by_id:
         logger.warning("No repos found in CSV.")
         return
 
-    summary_rows = []
-
-    for row in rows:
-        repo_id = row["repo_id"]
-        repo_spec = row["repo_spec"]
-        t0_value = row.get("t0", "")
-        try:
-            repo_t0 = parse_iso_datetime(t0_value) if t0_value else global_t0
-        except Exception as exc:
-            logger.error("Invalid t0 for repo %s: %s", repo_id, exc)
-            continue
-        repo_t1 = global_t1
-
-        metrics_json_path = dirs["metrics"] / f"{repo_id}.json"
-        commits_csv_path = dirs["metrics"] / f"{repo_id}_commits.csv"
-
-        metrics_data = None
-        default_branch = None
-
-        if metrics_json_path.exists():
-            logger.info("Skipping %s (cached metrics found).", repo_id)
-            try:
-                with metrics_json_path.open("r", encoding="utf-8") as f:
-                    metrics_data = json.load(f)
-                    default_branch = metrics_data.get("default_branch")
-            except Exception as exc:
-                logger.error("Failed to load cached metrics for %s: %s", repo_id, exc)
-                continue
-        else:
-            try:
-                repo_dir = ensure_cloned(repo_id, repo_spec, dirs["repos"], update=not args.no_update)
-                default_branch = get_default_branch(repo_dir)
-                commits = collect_commit_data(repo_dir, default_branch)
-                metrics = compute_metrics(commits, repo_t0, repo_t1)
-                remote_url_result = run_git_command(repo_dir, ["config", "--get", "remote.origin.url"])
-                remote_url = remote_url_result.stdout.strip() if remote_url_result.returncode == 0 else ""
-                write_commit_csv(commits_csv_path, repo_id, metrics["commits"])
-                write_metrics_json(
-                    metrics_json_path,
-                    repo_id,
-                    repo_spec,
-                    remote_url,
-                    default_branch,
-                    repo_t0,
-                    repo_t1,
-                    metrics,
-                )
-                metrics_data = {
-                    **metrics,
-                    "repo_id": repo_id,
-                    "repo": repo_spec,
-                    "default_branch": default_branch,
-                    "t0": repo_t0.isoformat(),
-                    "t1": repo_t1.isoformat() if repo_t1 else None,
-                }
-                logger.info("Processed %s with %d commits.", repo_id, len(commits))
-            except Exception as exc:
-                logger.error("Failed processing %s: %s", repo_id, exc)
-                continue
-
-        if metrics_data:
-            summary_rows.append(
-                build_summary_row(repo_id, repo_spec, default_branch or "", metrics_data)
+    jobs = max(1, args.jobs) if args.jobs is not None else min(32, (os.cpu_count() or 1) * 4)
+    # Threads clone/fetch (I/O bound) and wait on the process pool, which parses and scores
+    # history on all cores. Workers are spawned rather than forked: they are started from
+    # the clone threads, and a fork there can inherit locks held by another thread.
+    analyze_workers = min(jobs, os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=analyze_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as analyze_pool, ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                process_repo_rows, indexed_rows, dirs, global_t0, global_t1, args, logger, analyze_pool
             )
+            for indexed_rows in rows_by_id.values()
+        ]
+        results: List[Optional[Dict]] = [None] * row_count
+        for future in as_completed(futures):
+            for idx, summary_row in future.result():
+                results[idx] = summary_row
+
+    # Keep the summary in CSV order regardless of which repo finished first.
+    summary_rows = [row for row in results if row]
 
     if summary_rows:
         summary_path = dirs["summary"] / "metrics_summary.csv"
@@ -7,15 +7,67 @@ Usage: python3 ui/server.py --work-dir work --port 8000
 
 import argparse
 import csv
+import gzip
 import json
 import os
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from functools import lru_cache
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import unquote
 
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used when it is not installed
+    orjson = None
+
 # Resolve relative to project root (parent of ui/)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 JUDGE_RESPONSES_PATH = PROJECT_ROOT / "data" / "judge-responses-normalized.json"
+# Smaller bodies are sent uncompressed; gzip framing would outweigh the savings.
+GZIP_MIN_BYTES = 1024
+
+
+# Parsed artifacts are cached per (path, mtime, size), so a rerun of scan.py is picked up
+# on the next request while repeated requests skip re-parsing. Cached values are shared
+# across requests and must not be mutated.
+@lru_cache(maxsize=64)
+def _load_csv_rows(path_str: str, mtime_ns: int, size: int) -> list:
+    with open(path_str, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@lru_cache(maxsize=64)
+def _load_json(path_str: str, mtime_ns: int, size: int):
+    with open(path_str, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=4)
+def _load_json_bytes(path_str: str, mtime_ns: int, size: int) -> bytes:
+    with open(path_str, encoding="utf-8") as f:
+        return dump_json_bytes(json.load(f))
+
+
+def dump_json_bytes(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def load_csv_rows(path: Path) -> list:
+    stat = os.stat(path)
+    return _load_csv_rows(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def load_json(path: Path):
+    stat = os.stat(path)
+    return _load_json(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def load_json_bytes(path: Path) -> bytes:
+    """Return the file re-serialized as a compact JSON response body, ready to send as-is."""
+    stat = os.stat(path)
+    return _load_json_bytes(str(path), stat.st_mtime_ns, stat.st_size)
 
 
 class UiHandler(SimpleHTTPRequestHandler):
@@ -25,17 +77,23 @@ class UiHandler(SimpleHTTPRequestHandler):
         super().__init__(*args, directory=str(static_dir), **kwargs)
 
     def _send_json(self, payload, status=200):
-        data = json.dumps(payload).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(data)))
-        self.end_headers()
-        self.wfile.write(data)
+        self._send_json_bytes(dump_json_bytes(payload), status=status)
+
+    def _send_json_bytes(self, data, status=200):
+        self._send_body(data, "application/json", status)
 
     def _send_text(self, text, status=200):
-        data = text.encode("utf-8")
+        self._send_body(text.encode("utf-8"), "text/plain; charset=utf-8", status)
+
+    def _send_body(self, data, content_type, status):
+        gzipped = len(data) > GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", "").lower()
+        if gzipped:
+            data = gzip.compress(data, compresslevel=1)
         self.send_response(status)
-        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Type", content_type)
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
         self.send_header("Content-Length", str(len(data)))
         self.end_headers()
         self.wfile.write(data)
@@ -54,21 +112,16 @@ class UiHandler(SimpleHTTPRequestHandler):
         summary_path = self.work_dir / "summary" / "metrics_summary.csv"
         if not summary_path.exists():
             return self._send_json({"error": "summary not found"}, status=404)
-        rows = []
-        with summary_path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append(row)
-        return self._send_json({"rows": rows})
+        return self._send_json({"rows": load_csv_rows(summary_path)})
 
     def handle_judges(self):
         if not JUDGE_RESPONSES_PATH.exists():
             return self._send_json({"error": "judge data not found"}, status=404)
         try:
-            data = json.loads(JUDGE_RESPONSES_PATH.read_text(encoding="utf-8"))
+            data = load_json_bytes(JUDGE_RESPONSES_PATH)
         except Exception as exc:
             return self._send_json({"error": f"failed to load judge data: {exc}"}, status=500)
-        return self._send_json(data)
+        return self._send_json_bytes(data)
 
     def handle_repo(self, path: str):
         parts = path.split("/")
@@ -83,18 +136,12 @@ class UiHandler(SimpleHTTPRequestHandler):
         if suffix.startswith("metrics"):
             if not metrics_path.exists():
                 return self._send_json({"error": "metrics not found"}, status=404)
-            data = json.loads(metrics_path.read_text(encoding="utf-8"))
-            return self._send_json(data)
+            return self._send_json(load_json(metrics_path))
 
         if suffix.startswith("commits"):
             if not commits_path.exists():
                 return self._send_json({"error": "commits not found"}, status=404)
-            commits = []
-            with commits_path.open(newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    commits.append(row)
-            return self._send_json({"rows": commits})
+            return self._send_json({"rows": load_csv_rows(commits_path)})
 
         if suffix.startswith("ai"):
             if not ai_path.exists():
@@ -106,7 +153,7 @@ class UiHandler(SimpleHTTPRequestHandler):
 
 def run_server(work_dir: Path, static_dir: Path, port: int):
     handler = lambda *args, **kwargs: UiHandler(*args, work_dir=work_dir, static_dir=static_dir, **kwargs)
-    httpd = HTTPServer(("0.0.0.0", port), handler)
+    httpd = ThreadingHTTPServer(("0.0.0.0", port), handler)
     print(f"Serving UI at http://localhost:{port} (work dir: {work_dir})")
     httpd.serve_forever()
 